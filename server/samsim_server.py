@@ -12,11 +12,13 @@ This server bridges DCS World and the web browser interface.
 import asyncio
 import json
 import logging
+import re
+import signal
 import socket
-import threading
+import zlib
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 try:
     import websockets
@@ -31,6 +33,19 @@ except ImportError:
     print("Please install aiohttp: pip install aiohttp")
     exit(1)
 
+# orjson is optional: it parses bytes directly and serializes straight to
+# bytes, which keeps the per-packet and per-broadcast JSON cost low.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -38,8 +53,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger('SAMSIM')
 
+# WebSocket messages to the browser are binary frames whose first byte says
+# whether the JSON that follows is plain or zlib-compressed
+_FRAME_RAW = b'\x00'
+_FRAME_ZLIB = b'\x01'
+
+# Command acks are spliced from fixed bytes when the command name needs no
+# JSON escaping; command names are plain identifiers in practice
+_ACK_PREFIX = _FRAME_RAW + b'{"type":"ack","command":"'
+_ACK_SUFFIX = b'"}'
+_PLAIN_CMD = re.compile(r'[A-Za-z0-9_]+')
 
-@dataclass
+
+def _encode_ack(cmd) -> bytes:
+    """Encode an ack frame for a command name"""
+    if isinstance(cmd, str) and _PLAIN_CMD.fullmatch(cmd):
+        return _ACK_PREFIX + cmd.encode('ascii') + _ACK_SUFFIX
+    return _FRAME_RAW + json_dumps({'type': 'ack', 'command': cmd})
+
+
+@dataclass(slots=True)
 class ServerConfig:
     """Server configuration"""
     # DCS communication
@@ -55,8 +88,18 @@ class ServerConfig:
     # Broadcast interval for websocket clients
     broadcast_interval: float = 0.1  # 100ms
 
+    # Pending messages per websocket client before the oldest is dropped
+    ws_queue_size: int = 8
+
+    # Clients to fan a broadcast out to before yielding to the event loop
+    broadcast_batch_size: int = 50
+
+    # Messages larger than this many bytes are zlib-compressed once before
+    # being sent to every client (per-message deflate is disabled)
+    ws_compress_threshold: int = 1024
 
-@dataclass
+
+@dataclass(slots=True)
 class SAMSiteState:
     """State of a single SA-2 site"""
     site_id: str
@@ -72,13 +115,123 @@ class SAMSiteState:
     engagement_auth: bool = False
     auto_engage: bool = False
 
+    # Cached result of view(); reset to None whenever a field is written
+    _cached_view: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def view(self) -> dict:
+        """Site state as sent to WebSocket clients"""
+        if self._cached_view is None:
+            self._cached_view = self._build_view()
+        return self._cached_view
+
+    def _build_view(self) -> dict:
+        return {
+            'siteId': self.site_id,
+            'systemState': self.system_state,
+            'radarMode': self.radar_mode,
+            'antennaAz': self.antenna_az,
+            'antennaEl': self.antenna_el,
+            'targets': self.targets,
+            'tracked': self.tracked_target,
+            'trackQuality': self.track_quality,
+            'missilesReady': self.missiles_ready,
+            'missilesInFlight': self.missiles_in_flight,
+            'engAuth': self.engagement_auth,
+            'autoEng': self.auto_engage,
+        }
+
+
+# SAMSiteState attribute, DCS status key, default when the key is missing
+_SITE_FIELDS = [
+    ('system_state', 'systemState', 0),
+    ('radar_mode', 'radarMode', 0),
+    ('antenna_az', 'antennaAz', 0),
+    ('antenna_el', 'antennaEl', 5),
+    ('targets', 'targets', []),
+    ('tracked_target', 'tracked', None),
+    ('track_quality', 'trackQuality', 0),
+    ('missiles_ready', 'missilesReady', 6),
+    ('missiles_in_flight', 'missilesInFlight', 0),
+    ('engagement_auth', 'engAuth', False),
+    ('auto_engage', 'autoEng', False),
+]
+
+
+def _build_site_updater():
+    """Generate a straight-line function copying DCS site data onto a site
+
+    The generated _apply_site_update(site, d) writes only the fields whose
+    value changed, drops the site's cached view if any did, and returns
+    whether anything changed.
+    """
+    lines = [
+        'def _apply_site_update(site, d):',
+        '    changed = False',
+    ]
+    for attr, key, default in _SITE_FIELDS:
+        lines += [
+            f'    v = d.get({key!r}, {default!r})',
+            f'    if v != site.{attr}:',
+            f'        site.{attr} = v',
+            '        changed = True',
+        ]
+    lines += [
+        '    if changed:',
+        '        site._cached_view = None',
+        '    return changed',
+    ]
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['_apply_site_update']
+
+
+_apply_site_update = _build_site_updater()
+
+
+@dataclass(eq=False)
+class WSClient:
+    """A connected browser client and its outgoing message queue"""
+    websocket: object
+    # Items are (is_ack, message); acks are kept across a resync
+    queue: asyncio.Queue
+    # Broadcast payload last queued for this client. Held by reference and
+    # compared by identity: the cached payload object only changes when
+    # the state does, and holding it keeps its id from being reused. If a
+    # queued payload is dropped, needs_resync handles it: the resync runs
+    # before this is checked and resets it.
+    last_broadcast: Optional[bytes] = None
+    # Set when a queued message had to be dropped. Updates only carry
+    # changed sites, so the client then needs a full snapshot again.
+    needs_resync: bool = False
+
+
+class DCSProtocol(asyncio.DatagramProtocol):
+    """Receives datagrams from DCS Export.lua on the event loop"""
+
+    def __init__(self, server: 'SAMSIMServer'):
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr):
+        self.server._process_dcs_data(data)
+
+    def error_received(self, exc: Exception):
+        logger.error(f"UDP receive error: {exc}")
+
 
 class SAMSIMServer:
-    """Main SAMSIM server class"""
+    """Main SAMSIM server class
+
+    All state is owned by the asyncio event loop: UDP, WebSocket and HTTP
+    handlers as well as the broadcast loop run on the loop thread, so no
+    locking is needed. Code running in other threads must hand work to the
+    loop with loop.call_soon_threadsafe() instead of touching state directly.
+    """
 
     def __init__(self, config: ServerConfig):
         self.config = config
         self.running = False
+        self._stop_event: Optional[asyncio.Event] = None
 
         # DCS state
         self.dcs_connected = False
@@ -92,119 +245,111 @@ class SAMSIMServer:
         # World objects (aircraft, etc.)
         self.world_objects = []
 
-        # WebSocket clients
-        self.ws_clients: set = set()
+        # WebSocket clients, keyed by connection
+        self.ws_clients: dict[object, WSClient] = {}
 
-        # UDP sockets
-        self.udp_recv_socket: Optional[socket.socket] = None
-        self.udp_send_socket: Optional[socket.socket] = None
+        # Broadcast cache: the serialized update is only rebuilt when DCS
+        # data changed since the last tick. Site changes made in between
+        # are coalesced per site and sent together as one update.
+        self._state_dirty = True
+        self._pending_deltas: dict[str, dict] = {}
+        self._last_broadcast_bytes: Optional[bytes] = None
 
-        # Locks for thread safety
-        self.state_lock = threading.Lock()
+        # UDP endpoints
+        self.udp_transport: Optional[asyncio.DatagramTransport] = None
+        self.udp_send_socket: Optional[socket.socket] = None
 
     async def start(self):
         """Start the server"""
         logger.info("Starting SAMSIM Server...")
         self.running = True
+        self._stop_event = asyncio.Event()
 
-        # Initialize UDP sockets
+        # Initialize UDP send socket
         self._init_udp_sockets()
 
-        # Start all services
-        await asyncio.gather(
-            self._run_udp_receiver(),
-            self._run_websocket_server(),
-            self._run_http_server(),
-            self._broadcast_loop(),
-        )
+        # Start all services; each returns once stop() is called
+        try:
+            await asyncio.gather(
+                self._run_udp_receiver(),
+                self._run_websocket_server(),
+                self._run_http_server(),
+                self._broadcast_loop(),
+            )
+        finally:
+            self.udp_send_socket.close()
+        logger.info("SAMSIM Server stopped")
+
+    def stop(self):
+        """Ask all services to shut down gracefully"""
+        if self.running:
+            logger.info("Shutting down...")
+        self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
 
     def _init_udp_sockets(self):
-        """Initialize UDP sockets for DCS communication"""
-        # Receive socket
-        self.udp_recv_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.udp_recv_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.udp_recv_socket.bind(("0.0.0.0", self.config.dcs_recv_port))
-        self.udp_recv_socket.setblocking(False)
-
-        # Send socket
+        """Initialize UDP socket for sending commands to DCS"""
         self.udp_send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
-        logger.info(f"UDP receiver bound to port {self.config.dcs_recv_port}")
         logger.info(f"UDP sender ready to port {self.config.dcs_send_port}")
 
     async def _run_udp_receiver(self):
         """Receive data from DCS"""
-        logger.info("UDP receiver started")
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        self.udp_transport, _ = await loop.create_datagram_endpoint(
+            lambda: DCSProtocol(self),
+            local_addr=("0.0.0.0", self.config.dcs_recv_port),
+        )
+        logger.info(f"UDP receiver bound to port {self.config.dcs_recv_port}")
 
-        while self.running:
-            try:
-                # Use asyncio to handle the non-blocking socket
-                data = await loop.run_in_executor(
-                    None, self._recv_udp_data
-                )
-                if data:
-                    self._process_dcs_data(data)
-            except Exception as e:
-                if self.running:
-                    logger.error(f"UDP receive error: {e}")
-            await asyncio.sleep(0.01)
-
-    def _recv_udp_data(self) -> Optional[bytes]:
-        """Non-blocking UDP receive"""
         try:
-            data, addr = self.udp_recv_socket.recvfrom(65535)
-            return data
-        except BlockingIOError:
-            return None
-        except Exception:
-            return None
+            await self._stop_event.wait()
+        finally:
+            self.udp_transport.close()
 
     def _process_dcs_data(self, data: bytes):
         """Process data received from DCS"""
         try:
-            message = json.loads(data.decode('utf-8'))
+            message = json_loads(data)
             msg_type = message.get('type', '')
 
-            with self.state_lock:
-                if msg_type == 'init':
-                    self.dcs_connected = True
-                    logger.info("DCS connected")
-
-                elif msg_type == 'shutdown':
-                    self.dcs_connected = False
-                    logger.info("DCS disconnected")
-
-                elif msg_type == 'status':
-                    self.dcs_connected = True
-                    self.mission_time = message.get('time', 0)
-                    self.paused = message.get('paused', False)
-
-                    # Update world objects
-                    self.world_objects = message.get('worldObjects', [])
-
-                    # Update site states
-                    sites_data = message.get('sites', {})
-                    for site_id, site_data in sites_data.items():
-                        if site_id not in self.sites:
-                            self.sites[site_id] = SAMSiteState(site_id=site_id)
-
-                        site = self.sites[site_id]
-                        site.system_state = site_data.get('systemState', 0)
-                        site.radar_mode = site_data.get('radarMode', 0)
-                        site.antenna_az = site_data.get('antennaAz', 0)
-                        site.antenna_el = site_data.get('antennaEl', 5)
-                        site.targets = site_data.get('targets', [])
-                        site.tracked_target = site_data.get('tracked')
-                        site.track_quality = site_data.get('trackQuality', 0)
-                        site.missiles_ready = site_data.get('missilesReady', 6)
-                        site.missiles_in_flight = site_data.get('missilesInFlight', 0)
-                        site.engagement_auth = site_data.get('engAuth', False)
-                        site.auto_engage = site_data.get('autoEng', False)
-
-                elif msg_type == 'response':
-                    # Response from command - forward to WebSocket clients
-                    pass
+            if msg_type == 'init':
+                self.dcs_connected = True
+                self._state_dirty = True
+                logger.info("DCS connected")
+
+            elif msg_type == 'shutdown':
+                self.dcs_connected = False
+                self._state_dirty = True
+                logger.info("DCS disconnected")
+
+            elif msg_type == 'status':
+                self.dcs_connected = True
+                self.mission_time = message.get('time', 0)
+                self.paused = message.get('paused', False)
+
+                # Update world objects
+                self.world_objects = message.get('worldObjects', [])
+
+                # Update site states
+                sites_data = message.get('sites', {})
+                for site_id, site_data in sites_data.items():
+                    site = self.sites.get(site_id)
+                    is_new = site is None
+                    if is_new:
+                        site = SAMSiteState(site_id=site_id)
+                        self.sites[site_id] = site
+
+                    # Only sites that actually changed go into the next update
+                    if _apply_site_update(site, site_data) or is_new:
+                        self._pending_deltas[site_id] = site.view()
+
+                self._state_dirty = True
+
+            elif msg_type == 'response':
+                # Response from command - forward to WebSocket clients
+                pass
 
         except json.JSONDecodeError as e:
             logger.warning(f"Invalid JSON from DCS: {e}")
@@ -214,7 +359,7 @@ class SAMSIMServer:
     def send_to_dcs(self, command: dict):
         """Send command to DCS"""
         try:
-            data = json.dumps(command).encode('utf-8')
+            data = json_dumps(command)
             self.udp_send_socket.sendto(
                 data,
                 (self.config.dcs_host, self.config.dcs_send_port)
@@ -226,144 +371,213 @@ class SAMSIMServer:
     async def _run_websocket_server(self):
         """Run WebSocket server for browser clients"""
         async def handler(websocket):
-            # Register client
-            self.ws_clients.add(websocket)
+            # Register client with its own send queue so a slow client
+            # cannot hold up delivery to the others
+            client = WSClient(
+                websocket=websocket,
+                queue=asyncio.Queue(maxsize=self.config.ws_queue_size),
+            )
+            self.ws_clients[websocket] = client
+            send_task = asyncio.create_task(self._ws_sender(client))
+
+            # Updates only carry changed sites, so start from a full snapshot;
+            # it already covers the currently cached update
+            self._send_state_to_client(client)
+            client.last_broadcast = self._last_broadcast_bytes
+
             client_addr = websocket.remote_address
             logger.info(f"WebSocket client connected: {client_addr}")
 
             try:
                 async for message in websocket:
-                    await self._handle_ws_message(websocket, message)
+                    self._handle_ws_message(client, message)
             except websockets.exceptions.ConnectionClosed:
                 pass
             finally:
-                self.ws_clients.discard(websocket)
+                self.ws_clients.pop(websocket, None)
+                send_task.cancel()
                 logger.info(f"WebSocket client disconnected: {client_addr}")
 
         logger.info(f"WebSocket server starting on port {self.config.websocket_port}")
-        async with ws_serve(handler, "0.0.0.0", self.config.websocket_port):
-            await asyncio.Future()  # Run forever
-
-    async def _handle_ws_message(self, websocket, message: str):
+        # Large messages are compressed once in _encode_frame rather than
+        # per client and per message by permessage-deflate
+        async with ws_serve(handler, "0.0.0.0", self.config.websocket_port,
+                            compression=None):
+            # Leaving this block closes all client connections
+            await self._stop_event.wait()
+
+    async def _ws_sender(self, client: WSClient):
+        """Send queued messages to a WebSocket client"""
+        try:
+            while True:
+                _, message = await client.queue.get()
+                await client.websocket.send(message)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            # Nothing drains the queue after this, so close the connection;
+            # the handler then drops the client and the browser reconnects
+            logger.error(f"Failed to send to WebSocket client: {e}")
+            await client.websocket.close(1011)
+
+    def _enqueue(self, client: WSClient, message: bytes, is_ack: bool = False):
+        """Queue a message for a client, dropping its oldest one if full"""
+        item = (is_ack, message)
+        try:
+            client.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            client.queue.get_nowait()
+            client.queue.put_nowait(item)
+            client.needs_resync = True
+
+    def _resync_client(self, client: WSClient):
+        """Replace a client's queued state frames with a fresh snapshot
+
+        Pending acks stay queued ahead of the snapshot; an ack that was
+        already dropped cannot be recovered.
+        """
+        acks = []
+        while not client.queue.empty():
+            is_ack, message = client.queue.get_nowait()
+            if is_ack:
+                acks.append(message)
+        client.needs_resync = False
+        for message in acks:
+            client.queue.put_nowait((True, message))
+        self._send_state_to_client(client)
+
+    def _handle_ws_message(self, client: WSClient, message: Union[str, bytes]):
         """Handle message from WebSocket client"""
         try:
-            data = json.loads(message)
-            cmd_type = data.get('type', '')
-
-            if cmd_type == 'command':
-                # Forward command to DCS
-                command = data.get('command', {})
-                self.send_to_dcs(command)
-
-                # Send acknowledgment
-                await websocket.send(json.dumps({
-                    'type': 'ack',
-                    'command': command.get('cmd'),
-                }))
-
-            elif cmd_type == 'init_site':
-                # Initialize a new SA-2 site
-                site_id = data.get('siteId')
-                group_name = data.get('groupName')
-
-                command = {
-                    'cmd': 'init_site',
-                    'siteId': site_id,
-                    'params': {'groupName': group_name}
-                }
-                self.send_to_dcs(command)
-
-                # Create local state
-                with self.state_lock:
-                    if site_id not in self.sites:
-                        self.sites[site_id] = SAMSiteState(site_id=site_id)
-
-            elif cmd_type == 'get_state':
-                # Send current state to client
-                await self._send_state_to_client(websocket)
+            # Text and binary frames both parse directly, no decode step
+            data = json_loads(message)
+            handler = self._WS_HANDLERS.get(data.get('type', ''))
+            if handler is not None:
+                handler(self, client, data)
 
         except json.JSONDecodeError:
             logger.warning(f"Invalid JSON from WebSocket: {message}")
         except Exception as e:
             logger.error(f"Error handling WebSocket message: {e}")
 
-    async def _send_state_to_client(self, websocket):
+    def _ws_command(self, client: WSClient, data: dict):
+        """Forward a command to DCS and acknowledge it"""
+        command = data.get('command', {})
+        self.send_to_dcs(command)
+
+        # Send acknowledgment
+        self._enqueue(client, _encode_ack(command.get('cmd')), is_ack=True)
+
+    def _ws_init_site(self, client: WSClient, data: dict):
+        """Initialize a new SA-2 site"""
+        site_id = data.get('siteId')
+        group_name = data.get('groupName')
+
+        command = {
+            'cmd': 'init_site',
+            'siteId': site_id,
+            'params': {'groupName': group_name}
+        }
+        self.send_to_dcs(command)
+
+        # Create local state
+        if site_id not in self.sites:
+            site = SAMSiteState(site_id=site_id)
+            self.sites[site_id] = site
+            self._pending_deltas[site_id] = site.view()
+            self._state_dirty = True
+
+    def _ws_get_state(self, client: WSClient, data: dict):
+        """Send current state to the requesting client"""
+        self._send_state_to_client(client)
+
+    # WebSocket message type -> handler
+    _WS_HANDLERS = {
+        'command': _ws_command,
+        'init_site': _ws_init_site,
+        'get_state': _ws_get_state,
+    }
+
+    def _send_state_to_client(self, client: WSClient):
         """Send current state to a WebSocket client"""
-        with self.state_lock:
-            state = {
-                'type': 'state',
-                'dcsConnected': self.dcs_connected,
-                'missionTime': self.mission_time,
-                'paused': self.paused,
-                'sites': {
-                    site_id: {
-                        'siteId': site.site_id,
-                        'systemState': site.system_state,
-                        'radarMode': site.radar_mode,
-                        'antennaAz': site.antenna_az,
-                        'antennaEl': site.antenna_el,
-                        'targets': site.targets,
-                        'tracked': site.tracked_target,
-                        'trackQuality': site.track_quality,
-                        'missilesReady': site.missiles_ready,
-                        'missilesInFlight': site.missiles_in_flight,
-                        'engAuth': site.engagement_auth,
-                        'autoEng': site.auto_engage,
-                    }
-                    for site_id, site in self.sites.items()
-                },
-                'worldObjects': self.world_objects,
-            }
-
-        try:
-            await websocket.send(json.dumps(state))
-        except Exception as e:
-            logger.error(f"Failed to send state to client: {e}")
+        state = {
+            'type': 'state',
+            'dcsConnected': self.dcs_connected,
+            'missionTime': self.mission_time,
+            'paused': self.paused,
+            'sites': {
+                site_id: site.view()
+                for site_id, site in self.sites.items()
+            },
+            'worldObjects': self.world_objects,
+        }
+
+        self._enqueue(client, self._encode_frame(json_dumps(state)))
 
     async def _broadcast_loop(self):
         """Broadcast state updates to all WebSocket clients"""
+        # Fixed-rate schedule on the loop's monotonic clock, so the time
+        # spent broadcasting does not stretch the interval
+        loop = asyncio.get_running_loop()
+        interval = self.config.broadcast_interval
+        next_tick = loop.time()
+
         while self.running:
             if self.ws_clients:
-                with self.state_lock:
-                    state = {
-                        'type': 'update',
-                        'dcsConnected': self.dcs_connected,
-                        'missionTime': self.mission_time,
-                        'paused': self.paused,
-                        'sites': {
-                            site_id: {
-                                'siteId': site.site_id,
-                                'systemState': site.system_state,
-                                'radarMode': site.radar_mode,
-                                'antennaAz': site.antenna_az,
-                                'antennaEl': site.antenna_el,
-                                'targets': site.targets,
-                                'tracked': site.tracked_target,
-                                'trackQuality': site.track_quality,
-                                'missilesReady': site.missiles_ready,
-                                'missilesInFlight': site.missiles_in_flight,
-                                'engAuth': site.engagement_auth,
-                                'autoEng': site.auto_engage,
-                            }
-                            for site_id, site in self.sites.items()
-                        },
-                        'worldObjects': self.world_objects,
-                    }
-
-                message = json.dumps(state)
-
-                # Broadcast to all clients
-                dead_clients = set()
-                for client in self.ws_clients:
-                    try:
-                        await client.send(message)
-                    except Exception:
-                        dead_clients.add(client)
-
-                # Remove dead clients
-                self.ws_clients -= dead_clients
-
-            await asyncio.sleep(self.config.broadcast_interval)
+                if self._state_dirty or self._last_broadcast_bytes is None:
+                    self._last_broadcast_bytes = self._build_broadcast()
+                message = self._last_broadcast_bytes
+
+                # Fan out to the client queues; their sender tasks do the
+                # actual sends concurrently, and disconnected clients remove
+                # themselves. Yield between batches so a large audience does
+                # not hold up UDP processing.
+                clients = list(self.ws_clients.values())
+                batch = self.config.broadcast_batch_size
+                for i in range(0, len(clients), batch):
+                    if i:
+                        await asyncio.sleep(0)
+                    for client in clients[i:i + batch]:
+                        # A client that lost a message gets a snapshot, which
+                        # also covers this tick's update
+                        if client.needs_resync:
+                            self._resync_client(client)
+                            client.last_broadcast = message
+                            continue
+                        # Idle ticks reuse the same payload object; skip it
+                        if client.last_broadcast is message:
+                            continue
+                        self._enqueue(client, message)
+                        client.last_broadcast = message
+
+            next_tick += interval
+            now = loop.time()
+            if now - next_tick > interval:
+                # Fell more than a tick behind; resync instead of bursting
+                next_tick = now
+            await asyncio.sleep(max(0.0, next_tick - now))
+
+    def _build_broadcast(self) -> bytes:
+        """Serialize the site changes since the last tick as one update"""
+        deltas = list(self._pending_deltas.values())
+        self._pending_deltas = {}
+        state = {
+            'type': 'update',
+            'dcsConnected': self.dcs_connected,
+            'missionTime': self.mission_time,
+            'paused': self.paused,
+            'deltas': deltas,
+            'worldObjects': self.world_objects,
+        }
+        self._state_dirty = False
+
+        return self._encode_frame(json_dumps(state))
+
+    def _encode_frame(self, payload: bytes) -> bytes:
+        """Wrap a JSON payload in a frame, compressing it if it is large"""
+        if len(payload) > self.config.ws_compress_threshold:
+            return _FRAME_ZLIB + zlib.compress(payload, 1)
+        return _FRAME_RAW + payload
 
     async def _run_http_server(self):
         """Run HTTP server for static files"""
@@ -390,17 +604,19 @@ class SAMSIMServer:
         await site.start()
 
         logger.info(f"HTTP server started on http://localhost:{self.config.http_port}")
-        await asyncio.Future()  # Run forever
+        try:
+            await self._stop_event.wait()
+        finally:
+            await runner.cleanup()
 
     async def _api_status(self, request):
         """API endpoint: Get current status"""
-        with self.state_lock:
-            status = {
-                'dcsConnected': self.dcs_connected,
-                'missionTime': self.mission_time,
-                'paused': self.paused,
-                'sites': list(self.sites.keys()),
-            }
+        status = {
+            'dcsConnected': self.dcs_connected,
+            'missionTime': self.mission_time,
+            'paused': self.paused,
+            'sites': list(self.sites.keys()),
+        }
         return web.json_response(status)
 
     async def _api_command(self, request):
@@ -452,8 +668,27 @@ def main():
     ╚═══════════════════════════════════════════════════════════╝
     """)
 
+    # uvloop is optional and not available on Windows; fall back to the
+    # default event loop when it is missing
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    async def run():
+        # Stop gracefully on Ctrl+C / SIGTERM. Windows event loops do not
+        # support signal handlers; there Ctrl+C raises KeyboardInterrupt.
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, server.stop)
+            except NotImplementedError:
+                pass
+        await server.start()
+
     try:
-        asyncio.run(server.start())
+        asyncio.run(run())
     except KeyboardInterrupt:
         logger.info("Shutting down...")
 
@@ -255,10 +255,14 @@ class SAMSimClient {
     }
 
     initWebSocket() {
+        this.textDecoder = this.textDecoder || new TextDecoder('utf-8');
+        this.messageChain = Promise.resolve();
         const wsUrl = `ws://${window.location.hostname}:8081`;
 
         try {
             this.ws = new WebSocket(wsUrl);
+            // Server sends JSON as binary frames (UTF-8 bytes)
+            this.ws.binaryType = 'arraybuffer';
 
             this.ws.onopen = () => {
                 this.updateConnectionStatus(true);
@@ -276,12 +280,12 @@ class SAMSimClient {
             };
 
             this.ws.onmessage = (event) => {
-                try {
-                    const data = JSON.parse(event.data);
-                    this.handleServerMessage(data);
-                } catch (e) {
-                    console.error('Failed to parse message:', e);
-                }
+                // Compressed frames decode asynchronously, so chain the
+                // handlers to keep messages in arrival order
+                this.messageChain = this.messageChain
+                    .then(() => this.decodeFrame(event.data))
+                    .then((text) => this.handleServerMessage(JSON.parse(text)))
+                    .catch((e) => console.error('Failed to parse message:', e));
             };
         } catch (e) {
             this.log('Failed to connect', 'error');
@@ -289,6 +293,22 @@ class SAMSimClient {
         }
     }
 
+    decodeFrame(data) {
+        // Text frames carry plain JSON; binary frames start with a type
+        // byte: 0 = JSON, 1 = zlib-compressed JSON
+        if (typeof data === 'string') {
+            return Promise.resolve(data);
+        }
+        const bytes = new Uint8Array(data);
+        const body = bytes.subarray(1);
+        if (bytes[0] === 1) {
+            const stream = new Blob([body]).stream()
+                .pipeThrough(new DecompressionStream('deflate'));
+            return new Response(stream).text();
+        }
+        return Promise.resolve(this.textDecoder.decode(body));
+    }
+
     initEventListeners() {
         // System selector
         const samSelect = document.getElementById('samSystemSelect');